@@ -12,6 +12,11 @@ import {
   AudioClassification,
   TextClassification
 } from './ai-pattern-recognition';
+import { parseBRRHeader } from './audio/brr-decoder-utils';
+
+// BRR candidates below this offset sit in ROM header/code regions and get the
+// stricter data checks in AudioExtractor.isValidBRRHeader
+const BRR_STRICT_REGION_END = 0x8000;
 
 export interface Tile {
   data: Uint8Array;
@@ -72,6 +77,7 @@ export interface BRRSample {
 
 export interface BRRBlock {
   header: number;
+  /** Read-only view of the 8 sample bytes in the source data */
   data: Uint8Array;
   shift: number;
   filter: number;
@@ -777,18 +783,13 @@ export class AudioExtractor {
    */
   async extractBRRSamples(data: Uint8Array, startOffset: number = 0, aiRecognizer?: AIPatternRecognizer): Promise<BRRSample[]> {
     const samples: BRRSample[] = [];
-    let offset = startOffset;
 
     // First, try to locate sample directory table if present
     const sampleDirectory = this.findSampleDirectory(data, startOffset);
 
-    while (offset + 9 < data.length) {
-      // Validate BRR block header before processing
-      if (!this.isValidBRRHeader(data, offset)) {
-        offset++;
-        continue;
-      }
-
+    // Only visit offsets whose BRR block header passes validation
+    let offset = this.nextBRRHeaderCandidate(data, startOffset);
+    while (offset >= 0) {
       const sample = await this.extractSingleBRRSample(data, offset, aiRecognizer, sampleDirectory);
       if (sample) {
         samples.push(sample);
@@ -799,6 +800,8 @@ export class AudioExtractor {
 
       // Safety check to avoid infinite loops
       if (samples.length > 256) break;
+
+      offset = this.nextBRRHeaderCandidate(data, offset);
     }
 
     return samples;
@@ -822,7 +825,8 @@ export class AudioExtractor {
     // Parse all blocks for this sample
     while (offset + 9 <= data.length) {
       const header = data[offset];
-      const blockData = data.slice(offset + 1, offset + 9);
+      // View into the source buffer; no per-block copy
+      const blockData = data.subarray(offset + 1, offset + 9);
 
       const block: BRRBlock = {
         header,
@@ -911,53 +915,78 @@ export class AudioExtractor {
     };
   }
 
+  /**
+   * Return the first offset at or after `from` whose header passes
+   * isValidBRRHeader, or -1 if there is none
+   *
+   * Scans lazily, so extraction only validates the offsets it actually
+   * reaches. Below BRR_STRICT_REGION_END, runs of $00/$FF padding are skipped
+   * as a whole: every block whose 8 data bytes fall inside such a run is
+   * rejected regardless of its header. This mirrors isValidBRRHeader's
+   * all-$00/$FF rule and must be kept in sync with it.
+   */
+  private nextBRRHeaderCandidate(data: Uint8Array, from: number): number {
+    for (let offset = from; offset + 9 < data.length; offset++) {
+      if (this.isValidBRRHeader(data, offset)) {
+        return offset;
+      }
+
+      const fill = data[offset + 1];
+      if (offset < BRR_STRICT_REGION_END && (fill === 0x00 || fill === 0xFF)) {
+        let runEnd = offset + 2;
+        while (runEnd < data.length && data[runEnd] === fill) runEnd++;
+
+        // Resume after the last offset whose data bytes lie inside the run
+        offset = Math.max(offset, Math.min(runEnd - 9, BRR_STRICT_REGION_END - 1));
+      }
+    }
+
+    return -1;
+  }
+
   /**
    * Validate BRR block header for proper format with enhanced debugging
    */
   private isValidBRRHeader(data: Uint8Array, offset: number): boolean {
     if (offset + 9 > data.length) return false;
 
-    const header = data[offset];
-
     // BRR header format: SSSSFFLE
     // S = Shift (4 bits, upper nibble)
     // F = Filter (2 bits)
     // L = Loop flag (1 bit)
     // E = End flag (1 bit)
-
-    const shift = (header & 0xF0) >> 4;    // Upper 4 bits
-    const filter = (header & 0x0C) >> 2;   // Bits 2-3
-    const loopFlag = (header & 0x02) !== 0; // Bit 1
-    const endFlag = (header & 0x01) !== 0;  // Bit 0
-
-    // Validate shift range (0-12 is typical, 0-15 is spec maximum)
-    if (shift > 15) {
-      console.log(`🚫 Invalid shift value ${shift} at offset 0x${offset.toString(16)}`);
-      return false;
-    }
-
-    // Validate filter range (0-3)
-    if (filter > 3) {
-      console.log(`🚫 Invalid filter value ${filter} at offset 0x${offset.toString(16)}`);
-      return false;
-    }
+    // Every header byte decodes to an in-range shift (0-15) and filter (0-3),
+    // so only the end flag takes part in validation
+    const { end: endFlag } = parseBRRHeader(data[offset]);
 
     // Additional validation: check if this could be actual BRR data
     // Skip validation if we're in ROM header regions (likely false positives)
-    if (offset < 0x8000) {
+    // (findBRRHeaderCandidates relies on the all-$00/$FF rule below)
+    if (offset < BRR_STRICT_REGION_END) {
       // More strict validation for ROM header regions
-      // Look for reasonable BRR patterns
-      const nextBytes = data.slice(offset + 1, offset + 9);
-      const allZero = nextBytes.every(b => b === 0);
-      const allFF = nextBytes.every(b => b === 0xFF);
+      // Look for reasonable BRR patterns; count up to three distinct data
+      // bytes in place rather than slicing the block
+      const first = data[offset + 1];
+      let second = -1;
+      let distinct = 1;
+      for (let i = offset + 2; i < offset + 9 && distinct < 3; i++) {
+        const value = data[i];
+        if (value === first || value === second) continue;
+        if (second === -1) {
+          second = value;
+          distinct = 2;
+        } else {
+          distinct = 3;
+        }
+      }
 
-      // These patterns are less likely to be actual BRR in header regions
-      if (allZero || allFF) {
+      // All-zero or all-$FF blocks are less likely to be actual BRR in header regions
+      if (distinct === 1 && (first === 0 || first === 0xFF)) {
         return false;
       }
 
       // Check for more realistic BRR data patterns
-      const hasVariedData = new Set(nextBytes).size > 2;
+      const hasVariedData = distinct > 2;
       if (!hasVariedData && !endFlag) {
         return false;
       }
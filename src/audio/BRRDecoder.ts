@@ -1,19 +1,184 @@
-import { BRRBlockHeader, ADSREnvelope } from '../types/audio-types';
-import { getStandardSampleRate } from './brr-decoder-utils';
-import { writeFileSync } from 'fs';
+import { ADSREnvelope } from '../types/audio-types';
+import { IS_LITTLE_ENDIAN, getStandardSampleRate } from './brr-decoder-utils';
+import { closeSync, openSync, writeSync } from 'fs';
 
 const SAMPLE_RATE = getStandardSampleRate();
 const MAX_INT16 = 32767;
 const MIN_INT16 = -32768;
+const OUTPUT_SCALE = 2; // Scale up for final output
+const STREAM_CHUNK_BLOCKS = 256; // 4096 samples per WAV write
+
+/**
+ * Saturate to the signed 16-bit range
+ *
+ * Compare-and-select rather than Math.min/Math.max calls, so it inlines into
+ * the decode loop as two conditional moves.
+ */
+function clamp16(value: number): number {
+  return value > MAX_INT16 ? MAX_INT16 : value < MIN_INT16 ? MIN_INT16 : value;
+}
+
+/**
+ * Decode one 9-byte block at `offset` into `out[start, start + 16)`, reading
+ * and updating the filter history in state[0] (prev1) and state[1] (prev2)
+ */
+type BlockKernel = (
+  brr: Uint8Array,
+  offset: number,
+  range: number,
+  out: Int16Array,
+  start: number,
+  state: Int32Array,
+  levels: Float64Array
+) => void;
+
+// One block decoder per BRR filter, with its coefficients written as integer
+// constants over a common denominator of 64 (applied with >> 6, as in SPC700
+// DSP cores). The filter is fixed for a block, so it is dispatched once per
+// block instead of being re-checked for every nibble.
+//
+// Every kernel follows the same contract and differs only in its prediction
+// term: unpack the 16 nibbles high-first, sign-extend and shift by `range`,
+// add the prediction and saturate, then rotate the history. The stored output
+// is saturated a second time, which is not redundant: the x2 output scale
+// folded into `levels` can take a 16-bit sample past the Int16 range.
+const BLOCK_KERNELS: ReadonlyArray<BlockKernel> = [
+  // Filter 0: no prediction
+  (brr, offset, range, out, start, state, levels) => {
+    let prev1 = state[0];
+    let prev2 = state[1];
+
+    for (let i = 0; i < 16; i++) {
+      const byte = brr[offset + 1 + (i >> 1)];
+      const nibble = (i & 1 ? byte : byte >> 4) & 0x0F; // High nibble first
+      const sample = clamp16(((nibble ^ 8) - 8) << range);
+
+      prev2 = prev1;
+      prev1 = sample;
+
+      out[start + i] = clamp16(sample * levels[start + i]);
+    }
+
+    state[0] = prev1;
+    state[1] = prev2;
+  },
+  // Filter 1: s + p1 * 15/16
+  (brr, offset, range, out, start, state, levels) => {
+    let prev1 = state[0];
+    let prev2 = state[1];
+
+    for (let i = 0; i < 16; i++) {
+      const byte = brr[offset + 1 + (i >> 1)];
+      const nibble = (i & 1 ? byte : byte >> 4) & 0x0F;
+      const sample = clamp16((((nibble ^ 8) - 8) << range) + ((60 * prev1) >> 6));
+
+      prev2 = prev1;
+      prev1 = sample;
+
+      out[start + i] = clamp16(sample * levels[start + i]);
+    }
+
+    state[0] = prev1;
+    state[1] = prev2;
+  },
+  // Filter 2: s + p1 * 61/32 - p2 * 15/16
+  (brr, offset, range, out, start, state, levels) => {
+    let prev1 = state[0];
+    let prev2 = state[1];
+
+    for (let i = 0; i < 16; i++) {
+      const byte = brr[offset + 1 + (i >> 1)];
+      const nibble = (i & 1 ? byte : byte >> 4) & 0x0F;
+      const sample = clamp16((((nibble ^ 8) - 8) << range) + ((122 * prev1 - 60 * prev2) >> 6));
+
+      prev2 = prev1;
+      prev1 = sample;
+
+      out[start + i] = clamp16(sample * levels[start + i]);
+    }
 
-// BRR filter coefficients (from SNES9x implementation)
-const BRR_FILTER_COEFFS = [
-  [0, 0],       // Filter 0
-  [15, 0],      // Filter 1: 15/16
-  [61, -15],    // Filter 2: 61/32 - 15/16
-  [115, -13]    // Filter 3: 115/64 - 13/16
+    state[0] = prev1;
+    state[1] = prev2;
+  },
+  // Filter 3: s + p1 * 115/64 - p2 * 13/16
+  (brr, offset, range, out, start, state, levels) => {
+    let prev1 = state[0];
+    let prev2 = state[1];
+
+    for (let i = 0; i < 16; i++) {
+      const byte = brr[offset + 1 + (i >> 1)];
+      const nibble = (i & 1 ? byte : byte >> 4) & 0x0F;
+      const sample = clamp16((((nibble ^ 8) - 8) << range) + ((115 * prev1 - 52 * prev2) >> 6));
+
+      prev2 = prev1;
+      prev1 = sample;
+
+      out[start + i] = clamp16(sample * levels[start + i]);
+    }
+
+    state[0] = prev1;
+    state[1] = prev2;
+  }
 ];
 
+/**
+ * Decode the BRR blocks in `brr[start, end)` into `out`, stopping after a block
+ * with the end flag set.
+ *
+ * Decoding, envelope, output gain and saturation are fused into a single pass:
+ * the filter runs on the raw decoded value and only the stored output is
+ * scaled by `levels[k]`, the ADSR envelope already multiplied by the output
+ * gain. Kept as standalone functions over typed arrays with only local numeric
+ * state so the engine can compile each block decoder to one tight loop.
+ * `state` carries the filter history (prev1, prev2) between calls, receives
+ * the sample index of the last loop-flagged block in state[2] (left untouched
+ * if none) and is flagged as ended (state[3] = 1) once the end block is
+ * reached. Returns the number of samples written.
+ */
+function decodeBRRBlocks(
+  brr: Uint8Array,
+  start: number,
+  end: number,
+  out: Int16Array,
+  state: Int32Array,
+  levels: Float64Array
+): number {
+  let written = 0;
+
+  for (let offset = start; offset + 9 <= end; offset += 9) {
+    const header = brr[offset];
+
+    if (header & 2) {
+      state[2] = written;
+    }
+
+    BLOCK_KERNELS[(header >> 2) & 0x03](brr, offset, header >> 4, out, written, state, levels);
+    written += 16;
+
+    if (header & 1) {
+      state[3] = 1;
+      break;
+    }
+  }
+
+  return written;
+}
+
+/**
+ * Count the blocks up to and including the first end-flagged block (or to the
+ * end of the data), reading only the header bytes at a 9-byte stride
+ */
+function countBRRBlocks(brr: Uint8Array): number {
+  let blocks = 0;
+
+  for (let offset = 0; offset + 9 <= brr.length; offset += 9) {
+    blocks++;
+    if (brr[offset] & 1) break;
+  }
+
+  return blocks;
+}
+
 // ADSR envelope processor
 class ADSRProcessor {
   private state: 'attack' | 'decay' | 'sustain' | 'release' = 'attack';
@@ -26,46 +191,72 @@ class ADSRProcessor {
     this.enabled = config.enabled;
   }
 
-  processSample(): number {
+  /**
+   * Generate the next `count` envelope levels (0.0-`scale`) in one pass.
+   *
+   * ADSR rates are fixed for the life of a note, so each phase is filled with
+   * a tight integer loop (or a constant fill) rather than stepping the state
+   * machine once per output sample. Folding the output gain in as `scale`
+   * leaves a single multiply per sample for the decoder.
+   */
+  generate(count: number, scale: number = 1.0): Float64Array {
+    const levels = new Float64Array(count);
+    const levelScale = scale / 2047;
+
     if (!this.enabled) {
-      return 1.0;
+      return levels.fill(scale);
     }
 
-    switch (this.state) {
-      case 'attack':
-        if (this.config.attack === 15) {
-          this.envelope += 1024; // Linear increase +1024 at rate 31
-        } else {
-          this.envelope += 32; // Linear increase +32 at specified rate
-        }
-        if (this.envelope >= 2047) {
-          this.envelope = 2047;
+    let envelope = this.envelope;
+    let i = 0;
+
+    if (this.state === 'attack') {
+      // Linear increase: +1024 at rate 31, +32 otherwise
+      const step = this.config.attack === 15 ? 1024 : 32;
+      while (i < count) {
+        envelope += step;
+        if (envelope >= 2047) {
+          envelope = 2047;
+          levels[i++] = scale;
           this.state = 'decay';
+          break;
         }
-        break;
+        levels[i++] = envelope * levelScale;
+      }
+    }
 
-      case 'decay':
-        this.envelope -= Math.max(1, (this.envelope - 1) >> 8);
-        if ((this.envelope >> 8) <= this.config.sustain) {
+    if (this.state === 'decay') {
+      while (i < count) {
+        envelope -= Math.max(1, (envelope - 1) >> 8);
+        levels[i++] = envelope * levelScale;
+        if ((envelope >> 8) <= this.config.sustain) {
           this.state = 'sustain';
+          break;
         }
-        break;
+      }
+    }
 
-      case 'sustain':
-        if (this.config.release > 0) {
-          this.envelope -= Math.max(1, (this.envelope - 1) >> 8);
+    if (this.state === 'sustain') {
+      if (this.config.release > 0) {
+        while (i < count) {
+          envelope -= Math.max(1, (envelope - 1) >> 8);
+          levels[i++] = envelope * levelScale;
         }
-        break;
+      } else {
+        levels.fill(envelope * levelScale, i);
+      }
+    }
 
-      case 'release':
-        this.envelope -= 8;
-        if (this.envelope < 0) {
-          this.envelope = 0;
-        }
-        break;
+    if (this.state === 'release') {
+      // Linear decrease of 8 per sample; the remainder stays at zero
+      while (i < count && envelope > 0) {
+        envelope = Math.max(0, envelope - 8);
+        levels[i++] = envelope * levelScale;
+      }
     }
 
-    return this.envelope / 2047.0;
+    this.envelope = envelope;
+    return levels;
   }
 
   keyOn(): void {
@@ -78,10 +269,44 @@ class ADSRProcessor {
   }
 }
 
+/**
+ * Build the 44-byte RIFF header for 16-bit mono PCM at SAMPLE_RATE
+ */
+function createWaveHeader(dataSize: number): Buffer {
+  const waveHeader = Buffer.alloc(44);
+
+  let offset = 0;
+  waveHeader.write('RIFF', offset); offset += 4;
+  waveHeader.writeUInt32LE(36 + dataSize, offset); offset += 4;
+  waveHeader.write('WAVE', offset); offset += 4;
+
+  waveHeader.write('fmt ', offset); offset += 4;
+  waveHeader.writeUInt32LE(16, offset); offset += 4;
+  waveHeader.writeUInt16LE(1, offset); offset += 2;
+  waveHeader.writeUInt16LE(1, offset); offset += 2;
+  waveHeader.writeUInt32LE(SAMPLE_RATE, offset); offset += 4;
+  waveHeader.writeUInt32LE(SAMPLE_RATE * 2, offset); offset += 4;
+  waveHeader.writeUInt16LE(2, offset); offset += 2;
+  waveHeader.writeUInt16LE(16, offset); offset += 2;
+
+  waveHeader.write('data', offset); offset += 4;
+  waveHeader.writeUInt32LE(dataSize, offset);
+
+  return waveHeader;
+}
+
+/**
+ * View 16-bit samples as little-endian PCM bytes, copying only on big-endian hosts
+ */
+function pcmBytes(samples: Int16Array): Buffer {
+  const bytes = Buffer.from(samples.buffer, samples.byteOffset, samples.byteLength);
+  return IS_LITTLE_ENDIAN ? bytes : Buffer.from(bytes).swap16();
+}
+
 class BRRDecoder {
   private brrData: Uint8Array;
-  private samples: number[] = [];
-  private prevSamples: [number, number] = [0, 0];
+  private samples: Int16Array = new Int16Array(0);
+  private decoderState: Int32Array = new Int32Array(4); // prev1, prev2, loop start, ended
   private adsrProcessor: ADSRProcessor;
   private pitch: number;
   private loopStart: number = 0;
@@ -104,160 +329,145 @@ class BRRDecoder {
     };
   }
 
-  private decodeBlock(data: Uint8Array): number[] {
-    const header: BRRBlockHeader = this.parseBRRHeader(data[0]);
-    const samples: number[] = [];
-
-    for (let i = 1; i < data.length; i++) {
-      const byte = data[i];
-
-      for (const nibble of [(byte >> 4) & 0x0F, byte & 0x0F]) {
-        let sample = nibble >= 8 ? nibble - 16 : nibble;
-
-        sample <<= header.range;
-
-        if (header.filter > 0) {
-          const coeffs = BRR_FILTER_COEFFS[header.filter];
-          sample += Math.floor(coeffs[0] * this.prevSamples[0]);
-          if (header.filter > 1) {
-            sample += Math.floor(coeffs[1] * this.prevSamples[1]);
-          }
-        }
-
-        sample = this.clamp16(sample);
-
-        this.prevSamples[1] = this.prevSamples[0];
-        this.prevSamples[0] = sample;
-
-        samples.push(sample);
-      }
-    }
-
-    return samples;
+  /**
+   * Point the decoder at new BRR data, clearing all per-sample state
+   *
+   * Lets one decoder (and its already-optimised decode path) be reused across
+   * many files instead of constructing a new instance per file.
+   */
+  public reset(brrData: Uint8Array): void {
+    this.brrData = brrData;
+    this.samples = new Int16Array(0);
+    this.decoderState.fill(0);
+    this.loopStart = 0;
+    this.loopEnabled = false;
+    this.adsrProcessor.keyOn();
   }
 
-  private parseBRRHeader(header: number): BRRBlockHeader {
-    return {
-      range: header >> 4,
-      filter: (header >> 2) & 0x03,
-      loop: (header & 2) !== 0,
-      end: (header & 1) !== 0
-    };
+  /**
+   * Change the playback pitch used by applyGaussianInterpolation (0x1000 = 1.0)
+   */
+  public setPitch(pitch: number): void {
+    this.pitch = pitch;
   }
 
-  private clamp16(value: number): number {
-    return Math.max(MIN_INT16, Math.min(MAX_INT16, value));
+  /**
+   * Replace the ADSR envelope; unspecified fields take the constructor defaults
+   */
+  public setADSR(adsrParams: Partial<ADSREnvelope>): void {
+    this.adsrProcessor = new ADSRProcessor(this.initADSR(adsrParams));
+    this.samples = new Int16Array(0); // Decoded with the old envelope
   }
 
-  public decode(): number[] {
-    this.samples = [];
+  public decode(): Int16Array {
+    // Size the output and envelope to the end block, not the whole input
+    const capacity = countBRRBlocks(this.brrData) * 16;
+    const samples = new Int16Array(capacity);
     this.adsrProcessor.keyOn();
-
-    let blockIndex = 0;
-    while (blockIndex + 9 <= this.brrData.length) {
-      const blockData = this.brrData.slice(blockIndex, blockIndex + 9);
-      const header = this.parseBRRHeader(blockData[0]);
-      const decodedSamples = this.decodeBlock(blockData);
-
-      // Handle loop flag
-      if (header.loop) {
-        this.loopStart = this.samples.length;
-        this.loopEnabled = true;
-      }
-
-      // Apply ADSR envelope to each sample
-      for (const sample of decodedSamples) {
-        const envelope = this.adsrProcessor.processSample();
-        const finalSample = this.clamp16(sample * envelope * 2); // Scale up for final output
-        this.samples.push(finalSample);
-      }
-
-      // Handle end flag
-      if (header.end) {
-        if (this.loopEnabled && header.loop) {
-          // In a real-time player, this would loop back to loopStart
-          // For file decoding, we stop here
-          break;
-        } else {
-          break;
-        }
-      }
-
-      blockIndex += 9;
+    const levels = this.adsrProcessor.generate(capacity, OUTPUT_SCALE);
+
+    // Start from silence: each call decodes the whole sample again
+    this.decoderState.fill(0);
+
+    // In a real-time player, a looped sample would continue from loopStart;
+    // for file decoding we stop at the end block
+    this.decoderState[2] = -1;
+    const sampleCount = decodeBRRBlocks(
+      this.brrData, 0, this.brrData.length, samples, this.decoderState, levels
+    );
+    if (this.decoderState[2] >= 0) {
+      this.loopStart = this.decoderState[2];
+      this.loopEnabled = true;
     }
 
+    this.samples = samples.subarray(0, sampleCount);
     return this.samples;
   }
 
   /**
-   * Apply Gaussian interpolation for pitch adjustment
+   * Apply 4-point interpolation for pitch adjustment
+   *
+   * Uses the 4-point, 3rd-order Hermite kernel (Niemitalo), which matches the
+   * 4-tap window of the SNES Gaussian interpolator. The output length is known
+   * up front, so each output sample is computed directly from its index.
    */
-  public applyGaussianInterpolation(samples: number[]): number[] {
+  public applyGaussianInterpolation(samples: Int16Array): Int16Array {
     if (this.pitch === 0x1000) {
       return samples; // No pitch adjustment needed
     }
 
     const pitchRatio = this.pitch / 0x1000;
-    const outputSamples: number[] = [];
-
-    // Gaussian interpolation coefficients (simplified)
-    const gaussianTable = [
-      0.0, 0.0625, 0.125, 0.1875, 0.25, 0.3125, 0.375, 0.4375,
-      0.5, 0.5625, 0.625, 0.6875, 0.75, 0.8125, 0.875, 0.9375
-    ];
+    const last = samples.length - 1;
+    const count = Math.max(0, Math.ceil((samples.length - 3) / pitchRatio));
+    const outputSamples = new Int16Array(count);
 
-    let pos = 0.0;
-    while (Math.floor(pos) < samples.length - 3) {
+    for (let k = 0; k < count; k++) {
+      const pos = k * pitchRatio;
       const idx = Math.floor(pos);
-      const frac = pos - idx;
-      const fracIndex = Math.floor(frac * 16) & 0x0F;
-
-      // 4-point Gaussian interpolation
-      const s0 = samples[Math.max(0, idx - 1)] || 0;
-      const s1 = samples[idx] || 0;
-      const s2 = samples[idx + 1] || 0;
-      const s3 = samples[Math.min(samples.length - 1, idx + 2)] || 0;
-
-      const g = gaussianTable[fracIndex];
-      const interpolated = Math.floor(
-        s1 * (1 - g) + s2 * g +
-        (s0 - s1 - s2 + s3) * g * (1 - g) * 0.25
-      );
-
-      outputSamples.push(this.clamp16(interpolated));
-      pos += pitchRatio;
+      const t = pos - idx;
+
+      const s0 = samples[Math.max(0, idx - 1)];
+      const s1 = samples[idx];
+      const s2 = samples[idx + 1];
+      const s3 = samples[Math.min(last, idx + 2)];
+
+      const c1 = 0.5 * (s2 - s0);
+      const c2 = s0 - 2.5 * s1 + 2 * s2 - 0.5 * s3;
+      const c3 = 0.5 * (s3 - s0) + 1.5 * (s1 - s2);
+
+      outputSamples[k] = clamp16(Math.floor(((c3 * t + c2) * t + c1) * t + s1));
     }
 
     return outputSamples;
   }
 
+  /**
+   * Write a 16-bit mono WAV file
+   *
+   * If decode() has been called since the last reset() or setADSR(), the
+   * buffer it returned is written as is, including any in-place changes the
+   * caller made to it. Otherwise the BRR data is decoded straight to the file.
+   */
   public exportToWAV(filename: string): void {
-    const numberOfSamples = this.samples.length;
-    const waveBuffer = Buffer.alloc(44 + numberOfSamples * 2);
-
-    let offset = 0;
-    waveBuffer.write('RIFF', offset); offset += 4;
-    waveBuffer.writeUInt32LE(36 + numberOfSamples * 2, offset); offset += 4;
-    waveBuffer.write('WAVE', offset); offset += 4;
-
-    waveBuffer.write('fmt ', offset); offset += 4;
-    waveBuffer.writeUInt32LE(16, offset); offset += 4;
-    waveBuffer.writeUInt16LE(1, offset); offset += 2;
-    waveBuffer.writeUInt16LE(1, offset); offset += 2;
-    waveBuffer.writeUInt32LE(SAMPLE_RATE, offset); offset += 4;
-    waveBuffer.writeUInt32LE(SAMPLE_RATE * 2, offset); offset += 4;
-    waveBuffer.writeUInt16LE(2, offset); offset += 2;
-    waveBuffer.writeUInt16LE(16, offset); offset += 2;
-
-    waveBuffer.write('data', offset); offset += 4;
-    waveBuffer.writeUInt32LE(numberOfSamples * 2, offset); offset += 4;
-
-    for (const sample of this.samples) {
-      waveBuffer.writeInt16LE(sample, offset);
-      offset += 2;
+    const fd = openSync(filename, 'w');
+    try {
+      if (this.samples.length > 0) {
+        writeSync(fd, createWaveHeader(this.samples.byteLength));
+        writeSync(fd, pcmBytes(this.samples));
+      } else {
+        this.streamToWAV(fd);
+      }
+    } finally {
+      closeSync(fd);
+    }
+  }
+
+  /**
+   * Decode the BRR data to an open WAV file without keeping the samples
+   *
+   * Blocks are decoded in fixed-size chunks into one reusable buffer and each
+   * chunk is written as soon as it is produced, so peak memory is bounded by
+   * the chunk size rather than the sample length. The header is patched with
+   * the final data size once the end block has been reached.
+   */
+  private streamToWAV(fd: number): void {
+    const chunk = new Int16Array(STREAM_CHUNK_BLOCKS * 16);
+    const state = new Int32Array(4);
+    state[2] = -1;
+    this.adsrProcessor.keyOn();
+
+    let dataSize = 0;
+    writeSync(fd, createWaveHeader(0));
+
+    for (let start = 0; start + 9 <= this.brrData.length && state[3] === 0; start += STREAM_CHUNK_BLOCKS * 9) {
+      const end = Math.min(this.brrData.length, start + STREAM_CHUNK_BLOCKS * 9);
+      const levels = this.adsrProcessor.generate(Math.floor((end - start) / 9) * 16, OUTPUT_SCALE);
+      const written = decodeBRRBlocks(this.brrData, start, end, chunk, state, levels);
+
+      dataSize += writeSync(fd, pcmBytes(chunk.subarray(0, written)));
     }
 
-    writeFileSync(filename, waveBuffer);
+    writeSync(fd, createWaveHeader(dataSize), 0, 44, 0);
   }
 }
 
@@ -1,4 +1,6 @@
 
+import { BRRBlockHeader } from '../types/audio-types';
+
 // =============================================================================
 // Custom Error Types
 // =============================================================================
@@ -43,11 +45,11 @@ class BRRBlock {
     }
 
     // Parse header byte (SSSS FFLE)
-    const header = data[0];
-    this.range = header >> 4;         // Left-shift amount (S)
-    this.filter = (header >> 2) & 3;  // Decoding filter (F)
-    this.loopFlag = (header & 2) !== 0;  // Loop flag (L)
-    this.endFlag = (header & 1) !== 0;   // End flag (E)
+    const header = parseBRRHeader(data[0]);
+    this.range = header.range;
+    this.filter = header.filter;
+    this.loopFlag = header.loop;
+    this.endFlag = header.end;
 
     // Sample data bytes (8 bytes containing 16 4-bit samples)
     this.data = data.slice(1);
@@ -247,6 +249,12 @@ export function getStandardSampleRate(): number {
   return 32000;
 }
 
+/**
+ * True when the host stores multi-byte typed-array elements little-endian
+ * (WAV byte order), probed once at load
+ */
+export const IS_LITTLE_ENDIAN = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
 /**
  * Calculate pitch ratio from SNES pitch value
  */
@@ -258,4 +266,25 @@ export function calculatePitchRatio(pitch: number): number {
 // BRR Block Parsing Utilities
 // =============================================================================
 
+/**
+ * Decoded header fields for every possible header byte, built once at load
+ */
+const BRR_HEADER_TABLE: ReadonlyArray<Readonly<BRRBlockHeader>> = Array.from(
+  { length: 256 },
+  (_, header) => Object.freeze({
+    range: header >> 4,           // Left-shift amount (S)
+    filter: (header >> 2) & 3,    // Decoding filter (F)
+    end: (header & 1) !== 0,      // End flag (E)
+    loop: (header & 2) !== 0      // Loop flag (L)
+  })
+);
+
+/**
+ * Decode a BRR header byte (SSSS FFLE) by table lookup
+ *
+ * Entries are shared between callers and frozen; treat them as read-only.
+ */
+export function parseBRRHeader(header: number): Readonly<BRRBlockHeader> {
+  return BRR_HEADER_TABLE[header & 0xFF];
+}
 
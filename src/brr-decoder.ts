@@ -5,6 +5,8 @@
  * based on the official SNES development documentation.
  */
 
+import { IS_LITTLE_ENDIAN, parseBRRHeader } from './audio/brr-decoder-utils';
+
 interface BRRBlockInfo {
   range: number;        // Left-shift amount (0-15)
   filter: number;       // BRR filter number (0-3)
@@ -26,11 +28,11 @@ class BRRBlock {
     }
 
     // Parse header byte (SSSS FFLE)
-    const header = data[0];
-    this.range = header >>> 4;         // Left-shift amount (S)
-    this.filter = (header >>> 2) & 3; // Decoding filter (F)
-    this.loopFlag = (header & 2) !== 0;  // Loop flag (L)
-    this.endFlag = (header & 1) !== 0;   // End flag (E)
+    const header = parseBRRHeader(data[0]);
+    this.range = header.range;
+    this.filter = header.filter;
+    this.loopFlag = header.loop;
+    this.endFlag = header.end;
 
     // Sample data bytes (8 bytes containing 16 4-bit samples)
     this.data = data.slice(1);
@@ -162,6 +164,7 @@ export function decodeBRRFile(
     endBlocks: 0,
     filterUsage: { 0: 0, 1: 0, 2: 0, 3: 0 } as Record<number, number>
   };
+  const filterCounts = new Uint32Array(4);
 
   let prev1 = 0;
   let prev2 = 0;
@@ -185,7 +188,7 @@ export function decodeBRRFile(
     }
 
     // Track filter usage
-    stats.filterUsage[block.filter]++;
+    filterCounts[block.filter]++;
 
     // Decode 16 samples from this block
     let samples = block.decodeNibbles();
@@ -218,6 +221,11 @@ export function decodeBRRFile(
     }
   }
 
+  // Fold the per-block counters into the reported record once
+  filterCounts.forEach((count, filter) => {
+    stats.filterUsage[filter] = count;
+  });
+
   return {
     samples: pcmSamples,
     sampleRate: outputSampleRate,
@@ -227,6 +235,14 @@ export function decodeBRRFile(
   };
 }
 
+// RIFF chunk tags, encoded once
+const WAV_TAGS = {
+  riff: new TextEncoder().encode('RIFF'),
+  wave: new TextEncoder().encode('WAVE'),
+  fmt: new TextEncoder().encode('fmt '),
+  data: new TextEncoder().encode('data')
+};
+
 /**
  * Export BRR decoded samples to WAV format buffer.
  */
@@ -249,12 +265,12 @@ export function exportToWAV(
   let offset = 0;
 
   // RIFF chunk
-  uint8View.set(new TextEncoder().encode('RIFF'), offset); offset += 4;
+  uint8View.set(WAV_TAGS.riff, offset); offset += 4;
   view.setUint32(offset, fileSize - 8, true); offset += 4;
-  uint8View.set(new TextEncoder().encode('WAVE'), offset); offset += 4;
+  uint8View.set(WAV_TAGS.wave, offset); offset += 4;
 
   // fmt chunk
-  uint8View.set(new TextEncoder().encode('fmt '), offset); offset += 4;
+  uint8View.set(WAV_TAGS.fmt, offset); offset += 4;
   view.setUint32(offset, 16, true); offset += 4; // chunk size
   view.setUint16(offset, 1, true); offset += 2;  // audio format (PCM)
   view.setUint16(offset, numChannels, true); offset += 2;
@@ -264,13 +280,18 @@ export function exportToWAV(
   view.setUint16(offset, bitsPerSample, true); offset += 2;
 
   // data chunk
-  uint8View.set(new TextEncoder().encode('data'), offset); offset += 4;
+  uint8View.set(WAV_TAGS.data, offset); offset += 4;
   view.setUint32(offset, dataSize, true); offset += 4;
 
-  // Sample data
-  for (const sample of samples) {
-    view.setInt16(offset, sample, true);
-    offset += 2;
+  // Sample data is little-endian, so matching hosts copy it in bulk
+  // (header is 44 bytes, so the 16-bit view is aligned)
+  if (IS_LITTLE_ENDIAN) {
+    new Int16Array(buffer, offset, samples.length).set(samples);
+  } else {
+    for (const sample of samples) {
+      view.setInt16(offset, sample, true);
+      offset += 2;
+    }
   }
 
   return new Uint8Array(buffer);
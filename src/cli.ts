@@ -6,7 +6,7 @@
  * Usage: snes-disasm [options] <rom-file>
  */
 
-import { program } from 'commander';
+import { program, InvalidArgumentError } from 'commander';
 import { disassembleROM, CLIOptions } from './disassembly-handler';
 import { intro, outro, select, text, confirm, multiselect, spinner, note, isCancel, cancel } from '@clack/prompts';
 import { Listr } from 'listr2';
@@ -17,6 +17,19 @@ import { preferencesManager } from './cli/preferences-manager';
 import * as fs from 'fs';
 import * as path from 'path';
 
+/**
+ * Commander argument parser for positive integer options (decimal or 0x hex),
+ * so numeric options are converted once while the command line is parsed
+ */
+const parsePositiveInt = (value: string): number => {
+  // Checked up front: Number() alone also accepts 1e3, 0b101, 0o17 and padding
+  const parsed = /^(0x[0-9a-f]+|\d+)$/i.test(value) ? Number(value) : NaN;
+  if (!Number.isSafeInteger(parsed) || parsed < 1) {
+    throw new InvalidArgumentError('Not a positive integer.');
+  }
+  return parsed;
+};
+
 const runInteractiveMode = async () => {
   await sessionManager.load();
   
@@ -535,7 +548,7 @@ const handleBRRDecodingWorkflow = async () => {
   const options: CLIOptions = {
     decodeBrr: brrFile as string,
     brrOutput: outputFile as string,
-    brrSampleRate: sampleRate as string,
+    brrSampleRate: parseInt(sampleRate as string),
     brrEnableLooping: enableLooping as boolean,
     verbose: true
   };
@@ -745,9 +758,9 @@ async function main() {
     .option('--generate-docs', 'Generate documentation for discovered functions and data structures')
     .option('--decode-brr <file>', 'Decode BRR audio file to WAV format')
     .option('--brr-output <file>', 'Output file for BRR decoding (default: <brr-name>.wav)')
-    .option('--brr-sample-rate <rate>', 'Sample rate for BRR output (default: 32000)', '32000')
+    .option('--brr-sample-rate <rate>', 'Sample rate for BRR output (default: 32000)', parsePositiveInt, 32000)
     .option('--brr-enable-looping', 'Enable BRR loop processing')
-    .option('--brr-max-samples <count>', 'Maximum samples to decode from BRR', '1000000')
+    .option('--brr-max-samples <count>', 'Maximum samples to decode from BRR', parsePositiveInt, 1000000)
     .option('--brr-info', 'Show detailed BRR file information without decoding')
     .option('--brr-to-spc <input-dir> <output-spc>', 'Convert BRR files from input directory to a single SPC file')
     .option('-i, --interactive', 'Run in interactive mode')
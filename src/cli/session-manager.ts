@@ -521,9 +521,9 @@ export class SessionManager {
       assetFormats: baseOptions.assetFormats ?? asset.defaultAssetFormats?.join(','),
 
       // Apply BRR audio preferences
-      brrSampleRate: baseOptions.brrSampleRate ?? brr.defaultSampleRate?.toString(),
+      brrSampleRate: baseOptions.brrSampleRate ?? brr.defaultSampleRate,
       brrEnableLooping: baseOptions.brrEnableLooping ?? brr.enableLooping,
-      brrMaxSamples: baseOptions.brrMaxSamples ?? brr.maxSamples?.toString()
+      brrMaxSamples: baseOptions.brrMaxSamples ?? brr.maxSamples
     };
   }
 
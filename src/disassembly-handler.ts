@@ -25,12 +25,16 @@ async function processBRRFile(brrFile: string, options: CLIOptions): Promise<voi
     // Set up BRR decoder options
     const decoderOptions: BRRDecoderOptions = {
       enableLooping: options.brrEnableLooping || false,
-      maxSamples: parseInt(options.brrMaxSamples || '1000000'),
-      outputSampleRate: parseInt(options.brrSampleRate || '32000')
+      maxSamples: options.brrMaxSamples ?? 1000000,
+      outputSampleRate: options.brrSampleRate ?? 32000
     };
 
-    // Decode BRR file
-    const brrData = new Uint8Array(inputFileContent);
+    // Decode BRR file (view the read buffer in place rather than copying it)
+    const brrData = new Uint8Array(
+      inputFileContent.buffer,
+      inputFileContent.byteOffset,
+      inputFileContent.byteLength
+    );
     const decodedResult = decodeBRRFile(brrData, decoderOptions);
 
     // Show detailed BRR info if requested
@@ -89,9 +93,9 @@ export interface CLIOptions {
   generateDocs?: boolean;
   decodeBrr?: string;
   brrOutput?: string;
-  brrSampleRate?: string;
+  brrSampleRate?: number;
   brrEnableLooping?: boolean;
-  brrMaxSamples?: string;
+  brrMaxSamples?: number;
   brrInfo?: boolean;
   interactive?: boolean;
 }
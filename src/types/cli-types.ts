@@ -36,9 +36,9 @@ export interface CLIOptions {
   // BRR audio decoding options
   decodeBrr?: string;
   brrOutput?: string;
-  brrSampleRate?: string;
+  brrSampleRate?: number;
   brrEnableLooping?: boolean;
-  brrMaxSamples?: string;
+  brrMaxSamples?: number;
   brrInfo?: boolean;
 
   // Interactive mode
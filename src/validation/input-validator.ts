@@ -204,8 +204,8 @@ export class InputValidator {
     }
 
     // Validate BRR sample rate
-    if (options.brrSampleRate) {
-      const sampleRate = parseInt(options.brrSampleRate);
+    if (options.brrSampleRate !== undefined) {
+      const sampleRate = options.brrSampleRate;
       if (isNaN(sampleRate) || sampleRate < 1000 || sampleRate > 96000) {
         errors.push(new DisassemblerError(
           DisassemblerErrorType.BRR_DECODE_ERROR,
@@ -215,8 +215,8 @@ export class InputValidator {
     }
 
     // Validate BRR max samples
-    if (options.brrMaxSamples) {
-      const maxSamples = parseInt(options.brrMaxSamples);
+    if (options.brrMaxSamples !== undefined) {
+      const maxSamples = options.brrMaxSamples;
       if (isNaN(maxSamples) || maxSamples < 1 || maxSamples > 10000000) {
         errors.push(new DisassemblerError(
           DisassemblerErrorType.BRR_DECODE_ERROR,
@@ -18,11 +18,8 @@ const adsrParams = {
 
 describe('BRRDecoder', () => {
   beforeAll(() => {
-    // Ensure output directory exists
-    const outputDir = path.join(__dirname, '../output');
-    if (!fs.existsSync(outputDir)) {
-      fs.mkdirSync(outputDir, { recursive: true });
-    }
+    // Ensure output directory exists (recursive mkdir is a no-op if it does)
+    fs.mkdirSync(path.join(__dirname, '../output'), { recursive: true });
   });
 
   test('Basic BRR decoding', () => {
@@ -31,7 +28,7 @@ describe('BRRDecoder', () => {
     
     // Should decode 2 blocks * 16 samples = 32 samples
     expect(samples.length).toBe(32);
-    expect(Array.isArray(samples)).toBe(true);
+    expect(samples).toBeInstanceOf(Int16Array);
     expect(samples.every(sample => typeof sample === 'number')).toBe(true);
   });
 
@@ -44,7 +41,7 @@ describe('BRRDecoder', () => {
         const decodedSamples = decoder.decode();
 
         expect(decodedSamples.length).toBe(sample.expectedSamples);
-        expect(Array.isArray(decodedSamples)).toBe(true);
+        expect(decodedSamples).toBeInstanceOf(Int16Array);
         expect(decodedSamples.every(sample => typeof sample === 'number')).toBe(true);
       });
     });
@@ -55,7 +52,7 @@ describe('BRRDecoder', () => {
     const samples = decoder.decode();
     
     expect(samples.length).toBe(32);
-    expect(Array.isArray(samples)).toBe(true);
+    expect(samples).toBeInstanceOf(Int16Array);
   });
 
   test('Gaussian interpolation with pitch adjustment', () => {
@@ -65,7 +62,58 @@ describe('BRRDecoder', () => {
     
     // Interpolated samples should be different length due to pitch change
     expect(interpolatedSamples.length).toBeGreaterThan(0);
-    expect(Array.isArray(interpolatedSamples)).toBe(true);
+    expect(interpolatedSamples).toBeInstanceOf(Int16Array);
+  });
+
+  test('Output scaling saturates to 16-bit range', () => {
+    const loudData = new Uint8Array([0xC1, 0x70, 0x90, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]);
+    const samples = new BRRDecoder(loudData, { enabled: false }).decode();
+
+    expect(samples[0]).toBe(32767);
+    expect(samples[2]).toBe(-32768);
+  });
+
+  test('Decoder reuse via reset', () => {
+    const decoder = new BRRDecoder(testBRRData, adsrParams);
+    const first = Array.from(decoder.decode());
+
+    decoder.reset(new Uint8Array([0xC1, 0x70, 0x90, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]));
+    expect(decoder.decode().length).toBe(16);
+
+    decoder.reset(testBRRData);
+    expect(Array.from(decoder.decode())).toEqual(first);
+  });
+
+  test('Decoder reuse via pitch and ADSR setters', () => {
+    const decoder = new BRRDecoder(testBRRData);
+    decoder.setADSR(adsrParams);
+    decoder.setPitch(0x2000);
+    const rawSamples = decoder.decode();
+
+    const reference = new BRRDecoder(testBRRData, adsrParams, 0x2000);
+    const referenceSamples = reference.decode();
+    expect(Array.from(rawSamples)).toEqual(Array.from(referenceSamples));
+    expect(Array.from(decoder.applyGaussianInterpolation(rawSamples)))
+      .toEqual(Array.from(reference.applyGaussianInterpolation(referenceSamples)));
+  });
+
+  test('Reconfigured decoder matches a fresh one on the next decode', () => {
+    const filterData = createFilterTestData(2);
+    const decoder = new BRRDecoder(filterData);
+    decoder.decode();
+    decoder.setADSR(adsrParams);
+
+    const fresh = new BRRDecoder(filterData, adsrParams).decode();
+    expect(Array.from(decoder.decode())).toEqual(Array.from(fresh));
+  });
+
+  test('Decode buffer is sized to the end block', () => {
+    const trailing = new Uint8Array(9 * 1000);
+    trailing.set(testBRRData);
+    const samples = new BRRDecoder(trailing).decode();
+
+    expect(samples.length).toBe(32);
+    expect(samples.buffer.byteLength).toBe(32 * 2); // Blocks after the end flag are not allocated
   });
 
   test('Export to WAV', () => {
@@ -84,9 +132,56 @@ describe('BRRDecoder', () => {
     expect(stats.size).toBeGreaterThan(44); // WAV header is 44 bytes
     
     // Clean up
-    if (fs.existsSync(filePath)) {
-      fs.unlinkSync(filePath);
+    fs.unlinkSync(filePath);
+  });
+
+  test('Streamed WAV export matches decode() across chunks', () => {
+    // 600 blocks of mixed filters/ranges (decoded in 256-block chunks) with the
+    // end flag on block 300, partway through the second chunk
+    const blocks = 600;
+    const endBlock = 300;
+    const brrData = new Uint8Array(blocks * 9);
+    let seed = 12345;
+    for (let i = 0; i < brrData.length; i++) {
+      seed = (seed * 1103515245 + 12345) >>> 0;
+      brrData[i] = seed >>> 24;
+    }
+    for (let block = 0; block < blocks; block++) {
+      brrData[block * 9] = ((block % 12) << 4) | ((block % 4) << 2) | (block === endBlock ? 1 : 0);
     }
+
+    const expected = new BRRDecoder(brrData, adsrParams).decode();
+    expect(expected.length).toBe((endBlock + 1) * 16);
+
+    const filePath = path.join(__dirname, '../output', 'test_stream.wav');
+    new BRRDecoder(brrData, adsrParams).exportToWAV(filePath);
+    const wav = fs.readFileSync(filePath);
+    fs.unlinkSync(filePath);
+
+    const dataSize = expected.length * 2;
+    expect(wav.length).toBe(44 + dataSize);
+    expect(wav.toString('ascii', 0, 4)).toBe('RIFF');
+    expect(wav.readUInt32LE(4)).toBe(36 + dataSize);
+    expect(wav.toString('ascii', 36, 40)).toBe('data');
+    expect(wav.readUInt32LE(40)).toBe(dataSize);
+
+    const pcm = Array.from(expected, (_, i) => wav.readInt16LE(44 + i * 2));
+    expect(pcm).toEqual(Array.from(expected));
+  });
+
+  test('WAV export writes the decoded buffer, including in-place edits', () => {
+    const decoder = new BRRDecoder(testBRRData);
+    const samples = decoder.decode();
+    samples.fill(0, 16); // Silence the second block in place
+
+    const filePath = path.join(__dirname, '../output', 'test_edited.wav');
+    decoder.exportToWAV(filePath);
+    const wav = fs.readFileSync(filePath);
+    fs.unlinkSync(filePath);
+
+    expect(wav.readUInt32LE(40)).toBe(samples.length * 2);
+    const pcm = Array.from(samples, (_, i) => wav.readInt16LE(44 + i * 2));
+    expect(pcm).toEqual(Array.from(samples));
   });
 
   test('BRR block header parsing', () => {
@@ -98,6 +193,23 @@ describe('BRRDecoder', () => {
     expect(samples.length).toBeGreaterThan(0);
   });
 
+  test('Prediction filters 1-3 scale history by their fractional coefficients', () => {
+    // Hand-computed: s + (c1 * prev1 + c2 * prev2) >> 6 per filter, then x2 output gain
+    const expected: Record<number, number[]> = {
+      1: [2, 4, 8, 14, 22, 32, 44, 24, 8, -6, -16, -24, -30, -34, -34, -32],
+      2: [2, 6, 14, 28, 50, 80, 118, 132, 126, 104, 70, 26, -24, -76, -126, -170],
+      3: [2, 6, 14, 28, 48, 74, 106, 114, 104, 82, 52, 18, -16, -48, -76, -98]
+    };
+
+    for (const filter of [1, 2, 3]) {
+      const samples = new BRRDecoder(createFilterTestData(filter), { enabled: false }).decode();
+
+      expect(Array.from(samples)).toEqual(expected[filter]);
+      // Without the coefficient denominator every filtered block saturated
+      expect(samples.some(sample => sample === 32767 || sample === -32768)).toBe(false);
+    }
+  });
+
   test('Sample clamping', () => {
     // Create test data that might cause overflow
     const extremeData = new Uint8Array([
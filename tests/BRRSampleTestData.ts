@@ -8,23 +8,24 @@ export function createTestBRRData(): Uint8Array {
    * Create a simple test BRR sample for validation.
    * This mimics the Python create_test_brr_data() function.
    */
-  const testData: number[] = [];
+  // Two 9-byte blocks, written in place
+  const testData = new Uint8Array(18);
   
   // Block 1: Filter 0, no loop/end
-  testData.push(0x00); // Header: shift=0, filter=0, no loop, no end
+  testData[0] = 0x00; // Header: shift=0, filter=0, no loop, no end
   for (let i = 0; i < 8; i++) {
     // Create alternating nibbles: 0x01, 0x23, 0x45, etc.
-    testData.push((i * 2 + 1) << 4 | (i * 2 + 2));
+    testData[1 + i] = (i * 2 + 1) << 4 | (i * 2 + 2);
   }
   
   // Block 2: Filter 0, end flag set
-  testData.push(0x01); // Header: shift=0, filter=0, no loop, end=1
+  testData[9] = 0x01; // Header: shift=0, filter=0, no loop, end=1
   for (let i = 0; i < 8; i++) {
     // Decreasing pattern
-    testData.push(((7 - i) * 2 + 1) << 4 | ((7 - i) * 2));
+    testData[10 + i] = ((7 - i) * 2 + 1) << 4 | ((7 - i) * 2);
   }
   
-  return new Uint8Array(testData);
+  return testData;
 }
 
 export function createFilterTestData(filterType: number): Uint8Array {
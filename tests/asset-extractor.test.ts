@@ -0,0 +1,71 @@
+import { AudioExtractor } from '../src/asset-extractor';
+
+/**
+ * Reference scan: test every offset individually, without skipping padding
+ */
+function naiveCandidates(extractor: AudioExtractor, data: Uint8Array, startOffset: number): number[] {
+  const candidates: number[] = [];
+  for (let offset = startOffset; offset + 9 < data.length; offset++) {
+    if (extractor['isValidBRRHeader'](data, offset)) {
+      candidates.push(offset);
+    }
+  }
+  return candidates;
+}
+
+/**
+ * Every candidate the lazy scan yields, resuming one byte past each hit
+ */
+function scannedCandidates(extractor: AudioExtractor, data: Uint8Array, startOffset: number): number[] {
+  const candidates: number[] = [];
+  for (let offset = extractor['nextBRRHeaderCandidate'](data, startOffset); offset >= 0;
+    offset = extractor['nextBRRHeaderCandidate'](data, offset + 1)) {
+    candidates.push(offset);
+  }
+  return candidates;
+}
+
+function createPaddedData(seed: number): Uint8Array {
+  const data = new Uint8Array(0x9000);
+  for (let i = 0; i < data.length; i++) {
+    seed = (seed * 1103515245 + 12345) >>> 0;
+    data[i] = seed >>> 24;
+  }
+
+  // $00/$FF padding runs of assorted lengths, including runs that cross $8000
+  const runs: Array<[number, number, number]> = [
+    [0x0200, 0x0600, 0x00],
+    [0x1000, 0x1008, 0xFF],
+    [0x2000, 0x2009, 0x00],
+    [0x3000, 0x3011, 0xFF],
+    [0x7F00, 0x8100, 0x00],
+    [0x8400, 0x8500, 0xFF]
+  ];
+  for (const [start, end, fill] of runs) {
+    data.fill(fill, start, end);
+  }
+  return data;
+}
+
+describe('AudioExtractor BRR header scan', () => {
+  const extractor = new AudioExtractor();
+
+  test.each([1, 2, 3])('Candidate list matches a byte-by-byte scan (seed %i)', (seed) => {
+    const data = createPaddedData(seed);
+
+    for (const startOffset of [0, 0x200, 0x7F80]) {
+      const candidates = scannedCandidates(extractor, data, startOffset);
+      expect(candidates).toEqual(naiveCandidates(extractor, data, startOffset));
+    }
+  });
+
+  test('Padding runs that end around $8000 keep their boundary candidates', () => {
+    for (const runEnd of [0x7FF8, 0x8000, 0x8001, 0x8008, 0x8009]) {
+      const data = createPaddedData(7);
+      data.fill(0x00, 0x7E00, runEnd);
+
+      const candidates = scannedCandidates(extractor, data, 0x7D00);
+      expect(candidates).toEqual(naiveCandidates(extractor, data, 0x7D00));
+    }
+  });
+});
@@ -2,9 +2,11 @@ import unittest
 from BRRDecoder import BRRDecoder
 from brr_converter import create_test_brr_data
 
+_TEST_DATA = create_test_brr_data()
+
 class TestAudioIntegration(unittest.TestCase):
     def setUp(self):
-        self.test_data = create_test_brr_data()
+        self.test_data = _TEST_DATA
 
     def test_integration_with_known_rom(self):
         decoder = BRRDecoder(self.test_data)
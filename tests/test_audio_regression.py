@@ -3,17 +3,16 @@ from BRRDecoder import BRRDecoder
 
 class TestAudioRegression(unittest.TestCase):
 
-    def setUp(self):
-        # Edge Case BRR data
-        self.edges_cases = [
-            bytearray([0x7F] + [0x00] * 8),  # Max shift, no sound
-            bytearray([0x00] * 9),           # All zeroes
-            bytearray([0xFF] * 9),           # All max nibbles (sign-extend)
-        ]
+    # Edge Case BRR data
+    edges_cases = (
+        bytes([0x7F] + [0x00] * 8),  # Max shift, no sound
+        bytes([0x00] * 9),           # All zeroes
+        bytes([0xFF] * 9),           # All max nibbles (sign-extend)
+    )
 
     def test_brr_edge_cases(self):
         for edge_case in self.edges_cases:
-            decoder = BRRDecoder(bytes(edge_case))
+            decoder = BRRDecoder(edge_case)
             samples = decoder.decode()
             # Dummy condition, replace with expected outcome analysis
             self.assertTrue(len(samples) == 16)
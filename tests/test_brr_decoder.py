@@ -1,17 +1,14 @@
 import unittest
 from BRRDecoder import BRRDecoder
 
+# Dummy BRR block with simple pattern, built once for the whole module
+# First byte is header: shift=0, filter=0, no loop, no end
+_TEST_BRR = b'\x00' + b'\x55' * 8  # 0x55 for simplicity in all nibbles
+
 class TestBRRDecoder(unittest.TestCase):
     def setUp(self):
         # This is where you'd normally load or set up any common resources
-        self.test_brr_data = self.create_test_brr_data()
-
-    def create_test_brr_data(self) -> bytes:
-        """Creates a simple test BRR data for testing purposes."""
-        # Dummy BRR block with simple pattern
-        # First byte is header: shift=0, filter=0, no loop, no end
-        data = bytearray([0x00] + [0x55] * 8)  # 0x55 for simplicity in all nibbles
-        return bytes(data)
+        self.test_brr_data = _TEST_BRR
 
     def test_basic_brr_decoding(self):
         decoder = BRRDecoder(self.test_brr_data)
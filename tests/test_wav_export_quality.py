@@ -15,8 +15,12 @@ class TestWAVExportQuality(unittest.TestCase):
             frames = wav.readframes(wav.getnframes())
             samples = np.frombuffer(frames, dtype=np.int16)
 
-            # Check for clipping
-            self.assertFalse(np.any(samples > 32767) or np.any(samples < -32768))
+            # int16 samples cannot exceed full scale, so check the export
+            # is not empty or silent instead (one pass; int32 keeps
+            # abs(-32768) exact)
+            self.assertGreater(samples.size, 0)
+            peak = np.abs(samples, dtype=np.int32).max()
+            self.assertGreater(peak, 0)
 
 if __name__ == '__main__':
     unittest.main()